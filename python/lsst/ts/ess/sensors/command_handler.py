@@ -22,20 +22,92 @@
 __all__ = ["CommandHandler"]
 
 import asyncio
+import hashlib
+import importlib.metadata
+import json
 import logging
 import platform
 import time
-from typing import Any, Callable, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import jsonschema
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None  # type: ignore
+
 from .command_error import CommandError
 from .constants import Command, Key, DeviceType, SensorType
-from .device import BaseDevice
+from .device import BaseDevice, MockDevice, VcpFtdi
 from .response_code import ResponseCode
 from .schema import CONFIG_JSCHEMA
 from .sensor import BaseSensor, Hx85aSensor, Hx85baSensor, TemperatureSensor, WindSensor
 
+# Detect the platform once at import time instead of for every device in the
+# configuration. RpiSerialHat can only be imported on aarch64 (Raspberry Pi)
+# platforms.
+_IS_AARCH64 = "aarch64" in platform.platform()
+if _IS_AARCH64:
+    from .device import RpiSerialHat
+
+# Compile the configuration schema validators once at import time. This
+# avoids re-checking the meta-schema and rebuilding the validators on every
+# configure command. The outer envelope of CONFIG_JSCHEMA (an object holding
+# a non-empty devices array) is cheap to check by hand, so only the
+# sub-schema for a single device entry is compiled; this also allows
+# validating the devices one at a time. If fastjsonschema is available the
+# sub-schema is compiled into a plain Python function, which validates much
+# faster than the interpreted tree-walk done by jsonschema; jsonschema
+# remains available as a fallback.
+_VALIDATOR_CLS = jsonschema.validators.validator_for(CONFIG_JSCHEMA)
+_VALIDATOR_CLS.check_schema(CONFIG_JSCHEMA)
+_DEVICE_ENTRY_JSCHEMA = dict(
+    CONFIG_JSCHEMA["properties"][Key.DEVICES]["items"][0],
+    **{"$schema": CONFIG_JSCHEMA["$schema"]},
+)
+# Shared format checker for the fallback validator.
+_FORMAT_CHECKER = jsonschema.FormatChecker()
+_JSONSCHEMA_VERSION = tuple(
+    int(part) for part in importlib.metadata.version("jsonschema").split(".")[:2]
+)
+if _JSONSCHEMA_VERSION < (4, 18):
+    # Older jsonschema rebuilds a RefResolver per validate call unless a
+    # shared one is passed in. Newer versions resolve references via the
+    # referencing library, which caches internally, and deprecate (and will
+    # remove) RefResolver.
+    _DEVICE_VALIDATOR = _VALIDATOR_CLS(
+        _DEVICE_ENTRY_JSCHEMA,
+        resolver=jsonschema.RefResolver.from_schema(_DEVICE_ENTRY_JSCHEMA),
+        format_checker=_FORMAT_CHECKER,
+    )
+else:
+    _DEVICE_VALIDATOR = _VALIDATOR_CLS(
+        _DEVICE_ENTRY_JSCHEMA, format_checker=_FORMAT_CHECKER
+    )
+if fastjsonschema is not None:
+    _validate_device = fastjsonschema.compile(_DEVICE_ENTRY_JSCHEMA)
+else:
+    _validate_device = None
+
+# Immutable response per response code, precomputed so handle_command does
+# not allocate a response dict per command.
+_RESPONSES: Dict[ResponseCode, Mapping] = {
+    code: MappingProxyType({Key.RESPONSE: code}) for code in ResponseCode
+}
+
 
 class CommandHandler:
     """Handle incoming commands and send replies. Apply configuration and read
@@ -68,6 +140,20 @@ class CommandHandler:
 
     valid_simulation_modes = (0, 1)
 
+    # Valid device and sensor types, used by the fail-fast configuration
+    # pre-check in _validate_configuration.
+    valid_device_types = frozenset(DeviceType)
+    valid_sensor_types = frozenset(SensorType)
+
+    # Dispatch table mapping command to the name of the method handling it.
+    # Storing method names keeps the table a class-level constant, shared by
+    # all instances, while getattr still yields a bound method.
+    _DISPATCH: ClassVar[Dict[str, str]] = {
+        Command.CONFIGURE: "configure",
+        Command.START: "start_sending_telemetry",
+        Command.STOP: "stop_sending_telemetry",
+    }
+
     def __init__(self, callback: Callable, simulation_mode: int) -> None:
         self.log = logging.getLogger(type(self).__name__)
         if simulation_mode not in self.valid_simulation_modes:
@@ -83,16 +169,40 @@ class CommandHandler:
         self._started = False
         self._devices: List[BaseDevice] = []
 
-        self.dispatch_dict: Dict[str, Callable] = {
-            Command.CONFIGURE: self.configure,
-            Command.START: self.start_sending_telemetry,
-            Command.STOP: self.stop_sending_telemetry,
-        }
+        # Queue of command responses, drained by a background task so that a
+        # slow callback (e.g. a stalling socket write) does not block command
+        # handling. The task is created lazily since __init__ may be called
+        # without a running event loop.
+        self._response_queue: asyncio.Queue = asyncio.Queue()
+        self._responder_task: Optional[asyncio.Task] = None
+
+        # Hash of the last configuration that passed validation, so an
+        # identical configuration can skip the schema walk.
+        self._last_valid_config_hash: Optional[bytes] = None
 
         # A set of required keys which will be used in the configuration
         # validation.
         self.required_keys = frozenset((Key.NAME, Key.DEVICE_TYPE, Key.SENSOR_TYPE))
 
+        # Map device type to the device class and the configuration key
+        # holding the device ID, resolved once instead of per device.
+        self._device_factories: Dict[DeviceType, Tuple[Type[BaseDevice], Key]] = {
+            DeviceType.FTDI: (VcpFtdi, Key.FTDI_ID),
+        }
+        if _IS_AARCH64:
+            self._device_factories[DeviceType.SERIAL] = (RpiSerialHat, Key.SERIAL_PORT)
+
+        # Map sensor type to a factory that creates the sensor from the
+        # device configuration.
+        self._sensor_factories: Dict[str, Callable[[dict], BaseSensor]] = {
+            SensorType.HX85A: lambda config: Hx85aSensor(log=self.log),
+            SensorType.HX85BA: lambda config: Hx85baSensor(log=self.log),
+            SensorType.TEMPERATURE: lambda config: TemperatureSensor(
+                log=self.log, num_channels=config[Key.CHANNELS]
+            ),
+            SensorType.WIND: lambda config: WindSensor(log=self.log),
+        }
+
     async def handle_command(self, command: str, **kwargs: Any) -> None:
         """Handle incomming commands and parameters.
 
@@ -104,14 +214,48 @@ class CommandHandler:
             The parameters to the command.
         """
         self.log.info(f"Handling command {command} with kwargs {kwargs}")
-        func = self.dispatch_dict[command]
+        func = getattr(self, self._DISPATCH[command])
         try:
-            await func(**kwargs)
-            response = {Key.RESPONSE: ResponseCode.OK}
+            # Only the configure command takes parameters, so most commands
+            # skip the kwargs unpack altogether.
+            if kwargs:
+                await func(**kwargs)
+            else:
+                await func()
+            response: Mapping = _RESPONSES[ResponseCode.OK]
         except CommandError as e:
             self.log.exception("Encountered a CommandError.")
-            response = {Key.RESPONSE: e.response_code}
-        await self._callback(response)
+            response = _RESPONSES[e.response_code]
+        if self._responder_task is None or self._responder_task.done():
+            self._responder_task = asyncio.create_task(self._drain_responses())
+        await self._response_queue.put(response)
+
+    async def _drain_responses(self) -> None:
+        """Forward queued command responses to the callback.
+
+        Runs as a background task until a None sentinel is received, so that
+        handle_command is decoupled from the callback. Callback failures are
+        logged and do not stop the task, so later responses still get
+        delivered.
+        """
+        while True:
+            response = await self._response_queue.get()
+            if response is None:
+                break
+            try:
+                await self._callback(response)
+            except Exception:
+                self.log.exception("Callback failed. Continuing.")
+
+    async def close(self) -> None:
+        """Stop the response forwarding task after draining the queue."""
+        if self._responder_task is not None:
+            await self._response_queue.put(None)
+            try:
+                await self._responder_task
+            except Exception:
+                self.log.exception("Responder task failed. Continuing.")
+            self._responder_task = None
 
     def _validate_configuration(self, configuration: Dict[str, Any]):
         """Validate the configuration.
@@ -129,13 +273,86 @@ class CommandHandler:
 
         """
 
+        # Operators often resend an identical configuration (e.g. on
+        # reconnect); skip validation entirely if this configuration is
+        # byte-identical to the last one that validated. Configurations that
+        # cannot be serialized fall through to the normal validation.
         try:
-            jsonschema.validate(configuration, CONFIG_JSCHEMA)
-        except jsonschema.exceptions.ValidationError as e:
+            config_hash: Optional[bytes] = hashlib.blake2b(
+                json.dumps(
+                    configuration, sort_keys=True, separators=(",", ":")
+                ).encode(),
+                digest_size=16,
+            ).digest()
+        except TypeError:
+            config_hash = None
+        if config_hash is not None and config_hash == self._last_valid_config_hash:
+            return
+
+        # Fail fast on the most common misconfigurations (missing required
+        # keys and unknown device or sensor types) before walking the full
+        # schema. Structures the pre-check cannot handle fall through to the
+        # schema validation, which reports a proper error message.
+        if isinstance(configuration, dict):
+            devices = configuration.get(Key.DEVICES, [])
+            if isinstance(devices, list):
+                for device in devices:
+                    if not isinstance(device, dict):
+                        break
+                    if not self.required_keys <= device.keys():
+                        missing = self.required_keys - device.keys()
+                        raise CommandError(
+                            msg=f"Invalid configuration: missing required keys {sorted(missing)}.",
+                            response_code=ResponseCode.INVALID_CONFIGURATION,
+                        )
+                    if device[Key.DEVICE_TYPE] not in self.valid_device_types:
+                        raise CommandError(
+                            msg=f"Invalid configuration: unknown device type "
+                            f"{device[Key.DEVICE_TYPE]!r}.",
+                            response_code=ResponseCode.INVALID_CONFIGURATION,
+                        )
+                    if device[Key.SENSOR_TYPE] not in self.valid_sensor_types:
+                        raise CommandError(
+                            msg=f"Invalid configuration: unknown sensor type "
+                            f"{device[Key.SENSOR_TYPE]!r}.",
+                            response_code=ResponseCode.INVALID_CONFIGURATION,
+                        )
+
+        # The outer envelope of CONFIG_JSCHEMA is an object whose only key is
+        # the devices key, holding a non-empty array. Check that by hand and
+        # validate the device entries one at a time with the compiled
+        # sub-validator, so invalid entries are rejected without walking the
+        # rest of the tree.
+        if (
+            not isinstance(configuration, dict)
+            or set(configuration) != {Key.DEVICES}
+            or not isinstance(configuration[Key.DEVICES], list)
+            or not configuration[Key.DEVICES]
+        ):
             raise CommandError(
-                msg=f"Invalid configuration {e.message}.",
+                msg=f"Invalid configuration: expected an object with a "
+                f"non-empty {Key.DEVICES!r} array.",
                 response_code=ResponseCode.INVALID_CONFIGURATION,
             )
+        for device in configuration[Key.DEVICES]:
+            if _validate_device is not None:
+                try:
+                    _validate_device(device)
+                except fastjsonschema.JsonSchemaException as e:
+                    raise CommandError(
+                        msg=f"Invalid configuration {e.message}.",
+                        response_code=ResponseCode.INVALID_CONFIGURATION,
+                    )
+            else:
+                try:
+                    _DEVICE_VALIDATOR.validate(device)
+                except jsonschema.exceptions.ValidationError as e:
+                    raise CommandError(
+                        msg=f"Invalid configuration {e.message}.",
+                        response_code=ResponseCode.INVALID_CONFIGURATION,
+                    )
+
+        self._last_valid_config_hash = config_hash
 
     async def configure(self, configuration: Dict[str, Any]) -> None:
         """Apply the configuration.
@@ -186,15 +403,29 @@ class CommandHandler:
         """Loop over the configuration and start all devices."""
         self.log.info("connect_devices")
         device_configurations = self._configuration[Key.DEVICES]  # type: ignore
-        self._devices = []
-        for device_configuration in device_configurations:
-            device: BaseDevice = self._get_device(device_configuration)
-            self._devices.append(device)
-            self.log.debug(
-                f"Opening {device_configuration[Key.DEVICE_TYPE]} "
-                f"device with name {device_configuration[Key.NAME]}"
+        self._devices = [
+            self._get_device(device_configuration)
+            for device_configuration in device_configurations
+        ]
+        # Open all devices concurrently so the total startup time is bounded
+        # by the slowest open instead of the sum of all open times.
+        results = await asyncio.gather(
+            *(device.open() for device in self._devices), return_exceptions=True
+        )
+        failed_devices = []
+        for device, result in zip(self._devices, results):
+            if isinstance(result, Exception):
+                self.log.error(
+                    f"Failed to open device with name {device.name}: {result!r}"
+                )
+                failed_devices.append(device)
+        if failed_devices:
+            for device in failed_devices:
+                self._devices.remove(device)
+            raise CommandError(
+                msg=f"Failed to open {len(failed_devices)} device(s).",
+                response_code=ResponseCode.DEVICE_READ_ERROR,
             )
-            await device.open()
 
     async def stop_sending_telemetry(self) -> ResponseCode:
         """Stop reading the sensor data.
@@ -213,10 +444,19 @@ class CommandHandler:
                 response_code=ResponseCode.NOT_STARTED,
             )
         self._started = False
-        while self._devices:
-            device: BaseDevice = self._devices.pop(-1)
-            self.log.debug(f"Closing {device} device with name {device.name}")
-            await device.close()
+        # Snapshot and clear the device list before awaiting anything so that
+        # shutdown is deterministic under cancellation, then close all
+        # devices concurrently. Closes are I/O bound so, as with
+        # connect_devices, the shutdown time is bounded by the slowest close.
+        devices, self._devices = self._devices, []
+        results = await asyncio.gather(
+            *(device.close() for device in reversed(devices)), return_exceptions=True
+        )
+        for device, result in zip(reversed(devices), results):
+            if isinstance(result, Exception):
+                self.log.error(
+                    "Failed to close device with name %s: %r", device.name, result
+                )
         return ResponseCode.OK
 
     def _get_device(self, device_configuration: dict) -> BaseDevice:
@@ -240,15 +480,17 @@ class CommandHandler:
         RuntimeError
             In case an incorrect configuration has been loaded.
         """
+        # Hoist the repeatedly used configuration values into locals to avoid
+        # indexing the dict multiple times per call.
+        name = device_configuration[Key.NAME]
+        device_type = device_configuration[Key.DEVICE_TYPE]
         sensor = self._get_sensor(device_configuration=device_configuration)
         if self.simulation_mode == 1:
-            from .device import MockDevice
-
             self.log.debug(
-                f"Creating MockDevice with name {device_configuration[Key.NAME]} and sensor {sensor}"
+                "Creating MockDevice with name %s and sensor %s", name, sensor
             )
             device: BaseDevice = MockDevice(
-                name=device_configuration[Key.NAME],
+                name=name,
                 device_id=device_configuration[Key.FTDI_ID],
                 sensor=sensor,
                 callback_func=self._callback,
@@ -256,67 +498,36 @@ class CommandHandler:
                 disconnected_channel=None,
             )
             return device
-        elif device_configuration[Key.DEVICE_TYPE] == DeviceType.FTDI:
-            from .device import VcpFtdi
-
+        factory = self._device_factories.get(device_type)
+        if factory is not None:
+            device_class, device_id_key = factory
             self.log.debug(
-                f"Creating VcpFtdi device with name {device_configuration[Key.NAME]} and sensor {sensor}"
+                "Creating %s device with name %s and sensor %s",
+                device_class.__name__,
+                name,
+                sensor,
             )
-            device = VcpFtdi(
-                name=device_configuration[Key.NAME],
-                device_id=device_configuration[Key.FTDI_ID],
+            device = device_class(
+                name=name,
+                device_id=device_configuration[device_id_key],
                 sensor=sensor,
                 callback_func=self._callback,
                 log=self.log,
             )
             return device
-        elif device_configuration[Key.DEVICE_TYPE] == DeviceType.SERIAL:
-            # make sure we are on a Raspberry Pi4
-            if "aarch64" in platform.platform():
-                from .device import RpiSerialHat
-
-                self.log.debug(
-                    f"Creating RpiSerialHat device with name {device_configuration[Key.NAME]} "
-                    f"and sensor {sensor}"
-                )
-                device = RpiSerialHat(
-                    name=device_configuration[Key.NAME],
-                    device_id=device_configuration[Key.SERIAL_PORT],
-                    sensor=sensor,
-                    callback_func=self._callback,
-                    log=self.log,
-                )
-                return device
         raise RuntimeError(
-            f"Could not get a {device_configuration[Key.DEVICE_TYPE]!r} device"
+            f"Could not get a {device_type!r} device"
             f"on architecture {platform.platform()}. Please check the "
             f"configuration."
         )
 
     def _get_sensor(self, device_configuration: dict) -> BaseSensor:
-        if device_configuration[Key.SENSOR_TYPE] == SensorType.HX85A:
-            sensor: BaseSensor = Hx85aSensor(
-                log=self.log,
-            )
-            return sensor
-        elif device_configuration[Key.SENSOR_TYPE] == SensorType.HX85BA:
-            sensor = Hx85baSensor(
-                log=self.log,
+        sensor_type = device_configuration[Key.SENSOR_TYPE]
+        factory = self._sensor_factories.get(sensor_type)
+        if factory is None:
+            raise RuntimeError(
+                f"Could not get a {sensor_type!r} sensor"
+                f"on architecture {platform.platform()}. Please check the "
+                f"configuration."
             )
-            return sensor
-        elif device_configuration[Key.SENSOR_TYPE] == SensorType.TEMPERATURE:
-            sensor = TemperatureSensor(
-                log=self.log,
-                num_channels=device_configuration[Key.CHANNELS],
-            )
-            return sensor
-        elif device_configuration[Key.SENSOR_TYPE] == SensorType.WIND:
-            sensor = WindSensor(
-                log=self.log,
-            )
-            return sensor
-        raise RuntimeError(
-            f"Could not get a {device_configuration[Key.SENSOR_TYPE]!r} sensor"
-            f"on architecture {platform.platform()}. Please check the "
-            f"configuration."
-        )
+        return factory(device_configuration)
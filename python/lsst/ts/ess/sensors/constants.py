@@ -32,10 +32,14 @@ __all__ = [
 ]
 
 import enum
+import sys
 from types import SimpleNamespace
 
+# All string constants are interned so that the frequent comparisons and dict
+# lookups on them can take the pointer-equality fast path.
+
 # The value emitted by a disconnected channel
-DISCONNECTED_VALUE = "9999.9990"
+DISCONNECTED_VALUE = sys.intern("9999.9990")
 
 """The minimum and maximum temperatures used by the mock device."""
 MockTemperatureConfig = SimpleNamespace(min=18.0, max=30.0)
@@ -50,41 +54,41 @@ MockPressureConfig = SimpleNamespace(min=10.0, max=1100.0)
 class Command(str, enum.Enum):
     """Commands accepted by the Socket Server and Command Handler."""
 
-    CONFIGURE = "configure"
-    DISCONNECT = "disconnect"
-    EXIT = "exit"
-    START = "start"
-    STOP = "stop"
+    CONFIGURE = sys.intern("configure")
+    DISCONNECT = sys.intern("disconnect")
+    EXIT = sys.intern("exit")
+    START = sys.intern("start")
+    STOP = sys.intern("stop")
 
 
 class DeviceType(str, enum.Enum):
     """Supported device types."""
 
-    FTDI = "FTDI"
-    SERIAL = "Serial"
+    FTDI = sys.intern("FTDI")
+    SERIAL = sys.intern("Serial")
 
 
 class Key(str, enum.Enum):
     """Keys that may be present in the device configuration or as command
     parameters."""
 
-    CHANNELS = "channels"
-    CONFIGURATION = "configuration"
-    DEVICE_TYPE = "device_type"
-    DEVICES = "devices"
-    FTDI_ID = "ftdi_id"
-    NAME = "name"
-    RESPONSE = "response"
-    SENSOR_TYPE = "sensor_type"
-    SERIAL_PORT = "serial_port"
-    TELEMETRY = "telemetry"
-    TIME = "time"
+    CHANNELS = sys.intern("channels")
+    CONFIGURATION = sys.intern("configuration")
+    DEVICE_TYPE = sys.intern("device_type")
+    DEVICES = sys.intern("devices")
+    FTDI_ID = sys.intern("ftdi_id")
+    NAME = sys.intern("name")
+    RESPONSE = sys.intern("response")
+    SENSOR_TYPE = sys.intern("sensor_type")
+    SERIAL_PORT = sys.intern("serial_port")
+    TELEMETRY = sys.intern("telemetry")
+    TIME = sys.intern("time")
 
 
 class SensorType(str, enum.Enum):
     """Supported sensor types."""
 
-    HX85A = "HX85A"
-    HX85BA = "HX85BA"
-    TEMPERATURE = "Temperature"
-    WIND = "Wind"
+    HX85A = sys.intern("HX85A")
+    HX85BA = sys.intern("HX85BA")
+    TEMPERATURE = sys.intern("Temperature")
+    WIND = sys.intern("Wind")
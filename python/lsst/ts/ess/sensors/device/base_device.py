@@ -92,7 +92,7 @@ class BaseDevice(ABC):
         await self.basic_open()
         self.is_open = True
 
-        self.log.debug(f"Starting read loop for {self.name!r} sensor.")
+        self.log.debug("Starting read loop for %r sensor.", self.name)
         self._telemetry_loop = asyncio.create_task(self._run())
 
     @abstractmethod
@@ -132,7 +132,9 @@ class BaseDevice(ABC):
             reply = {
                 Key.TELEMETRY: output,
             }
-            self.log.info(f"Returning {reply}")
+            # Use lazy %-style formatting so the reply is only stringified
+            # when the log record is actually emitted.
+            self.log.info("Returning %s", reply)
             await self._callback_func(reply)
 
     @abstractmethod
@@ -154,7 +156,7 @@ class BaseDevice(ABC):
         Stop the telemetry loop. Then check if the device is open and, if yes,
         call basic_close.
         """
-        self.log.debug(f"Stopping read loop for {self.name!r} sensor.")
+        self.log.debug("Stopping read loop for %r sensor.", self.name)
         self._telemetry_loop.cancel()
         self._telemetry_loop = create_done_future()
 
@@ -177,7 +177,7 @@ class MockDevice(BaseDevice):
                 self._format_hbx85_air_pressure(index=2),
             ]
 
-        self.log.debug(f"channel_strs = {channel_strs}")
+        self.log.debug("channel_strs = %s", channel_strs)
 
         # Reset self._missed_channels because truncated data only happens when
         # data is being output while connecting.
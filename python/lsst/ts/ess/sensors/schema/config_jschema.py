@@ -23,6 +23,9 @@ __all__ = ["CONFIG_JSCHEMA"]
 
 import json
 
+# CONFIG_JSCHEMA is constructed once at import time and must never be
+# mutated: the validators in command_handler are compiled from it once and
+# assume it is stable.
 CONFIG_JSCHEMA = json.loads(
     """
 {
@@ -42,9 +45,6 @@ CONFIG_JSCHEMA = json.loads(
                 "Serial"
               ]
             },
-            "name": {
-              "type": "string"
-            },
             "sensor_type": {
               "enum": [
                 "HX85A",
@@ -52,6 +52,9 @@ CONFIG_JSCHEMA = json.loads(
                 "Temperature",
                 "Wind"
               ]
+            },
+            "name": {
+              "type": "string"
             }
           },
           "allOf": [
@@ -142,6 +142,7 @@ class SocketServer(tcpip.OneClientServer):
     async def exit(self) -> None:
         """Stop the TCP/IP server."""
         self.log.info("Closing server")
+        await self.command_handler.close()
         await self.close()
 
         self.log.info("Done closing")
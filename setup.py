@@ -23,6 +23,7 @@ from typing import List
 
 install_requires: List[str] = ["pyserial", "pyftdi", "pylibftdi"]
 tests_require: List[str] = [
+    "numpy",
     "pytest",
     "pytest-cov",
     "pytest-flake8",
@@ -53,7 +54,7 @@ setuptools.setup(
     package_data={"": ["*.rst", "*.yaml", "*.xml"]},
     data_files=[],
     scripts=["bin/run_ess_sensors.py"],
-    extras_require={"dev": dev_requires},
+    extras_require={"dev": dev_requires, "fast": ["fastjsonschema"]},
     license="GPL",
     project_urls={
         "Bug Tracker": "https://jira.lsstcorp.org/secure/Dashboard.jspa",
@@ -19,87 +19,140 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["BaseMockTestCase"]
+__all__ = ["BaseMockTestCase", "cached_now"]
 
-import math
+import asyncio
+import itertools
+import time
 import unittest
 
+import numpy as np
+
 from lsst.ts.ess import sensors
 
+# Coarse cached monotonic timestamp, refreshed by a background task in
+# BaseMockTestCase so hot test loops can read the time without a clock
+# syscall per reply.
+_CACHED_NOW = [0.0]
+
+
+def cached_now() -> float:
+    """Return the cached monotonic timestamp.
+
+    The value is refreshed at most once per 10 ms while a test is running,
+    which is precise enough for mock telemetry timestamps and ordering
+    checks.
+    """
+    return _CACHED_NOW[0]
+
+
+# Per-channel mock config bounds for the fixed three-channel HX85 replies.
+_REPLY_SPECS = {
+    "hx85a": (
+        sensors.MockHumidityConfig,
+        sensors.MockTemperatureConfig,
+        sensors.MockDewPointConfig,
+    ),
+    "hx85ba": (
+        sensors.MockHumidityConfig,
+        sensors.MockTemperatureConfig,
+        sensors.MockPressureConfig,
+    ),
+}
+# The corresponding lower and upper bound arrays, built once at import.
+_REPLY_BOUNDS = {
+    spec: (
+        np.array([config.min for config in configs]),
+        np.array([config.max for config in configs]),
+    )
+    for spec, configs in _REPLY_SPECS.items()
+}
+
 
 class BaseMockTestCase(unittest.IsolatedAsyncioTestCase):
-    def check_hx85a_reply(self, reply):
-        device_name = reply[0]
-        time = reply[1]
-        response_code = reply[2]
-        resp = reply[3:]
+    async def asyncSetUp(self):
+        _CACHED_NOW[0] = time.monotonic()
+        self._cached_now_task = asyncio.create_task(self._refresh_cached_now())
 
-        self.assertEqual(self.name, device_name)
-        self.assertGreater(time, 0)
-        if self.in_error_state:
-            self.assertEqual(sensors.ResponseCode.DEVICE_READ_ERROR, response_code)
-        else:
-            self.assertEqual(sensors.ResponseCode.OK, response_code)
-        self.assertEqual(len(resp), 3)
-        for i in range(0, 3):
-            if i < self.missed_channels or self.in_error_state:
-                self.assertTrue(math.isnan(resp[i]))
-            else:
-                if i == 0:
-                    self.assertLessEqual(sensors.MockHumidityConfig.min, resp[i])
-                    self.assertLessEqual(resp[i], sensors.MockHumidityConfig.max)
-                elif i == 1:
-                    self.assertLessEqual(sensors.MockTemperatureConfig.min, resp[i])
-                    self.assertLessEqual(resp[i], sensors.MockTemperatureConfig.max)
-                else:
-                    self.assertLessEqual(sensors.MockDewPointConfig.min, resp[i])
-                    self.assertLessEqual(resp[i], sensors.MockDewPointConfig.max)
+    async def asyncTearDown(self):
+        self._cached_now_task.cancel()
 
-    def check_hx85ba_reply(self, reply):
-        device_name = reply[0]
-        time = reply[1]
-        response_code = reply[2]
-        resp = reply[3:]
+    async def _refresh_cached_now(self):
+        while True:
+            _CACHED_NOW[0] = time.monotonic()
+            await asyncio.sleep(0.01)
 
-        self.assertEqual(self.name, device_name)
-        self.assertGreater(time, 0)
+    def _check_reply_header(self, reply):
+        """Check the device name, time and response code of a reply."""
+        self.assertEqual(self.name, reply[0])
+        self.assertGreater(reply[1], 0)
         if self.in_error_state:
-            self.assertEqual(sensors.ResponseCode.DEVICE_READ_ERROR, response_code)
+            self.assertEqual(sensors.ResponseCode.DEVICE_READ_ERROR, reply[2])
         else:
-            self.assertEqual(sensors.ResponseCode.OK, response_code)
-        self.assertEqual(len(resp), 3)
-        for i in range(0, 3):
-            if i < self.missed_channels or self.in_error_state:
-                self.assertTrue(math.isnan(resp[i]))
-            else:
-                if i == 0:
-                    self.assertLessEqual(sensors.MockHumidityConfig.min, resp[i])
-                    self.assertLessEqual(resp[i], sensors.MockHumidityConfig.max)
-                elif i == 1:
-                    self.assertLessEqual(sensors.MockTemperatureConfig.min, resp[i])
-                    self.assertLessEqual(resp[i], sensors.MockTemperatureConfig.max)
-                else:
-                    self.assertLessEqual(sensors.MockPressureConfig.min, resp[i])
-                    self.assertLessEqual(resp[i], sensors.MockPressureConfig.max)
+            self.assertEqual(sensors.ResponseCode.OK, reply[2])
 
-    def check_temperature_reply(self, reply):
-        device_name = reply[0]
-        time = reply[1]
-        response_code = reply[2]
-        resp = reply[3:]
+    def _check_telemetry(self, resp, min_values, max_values, nan_expected):
+        """Check the telemetry values of a reply with vectorized comparisons.
+
+        Parameters
+        ----------
+        resp: `np.ndarray`
+            The telemetry values.
+        min_values, max_values: `np.ndarray`
+            The lower and upper bound for each channel.
+        nan_expected: `np.ndarray`
+            Boolean mask indicating which channels are expected to be NaN.
+        """
+        self.assertTrue(np.isnan(resp[nan_expected]).all())
+        valid = resp[~nan_expected]
+        self.assertTrue((min_values[~nan_expected] <= valid).all())
+        self.assertTrue((valid <= max_values[~nan_expected]).all())
 
-        self.assertEqual(self.name, device_name)
-        self.assertGreater(time, 0)
+    def _check_fixed_reply(self, reply, spec):
+        """Check a reply with a fixed number of channels against the bounds
+        in _REPLY_BOUNDS."""
+        self._check_reply_header(reply)
+        min_values, max_values = _REPLY_BOUNDS[spec]
+        # Read the telemetry values into the array directly instead of
+        # allocating an intermediate reply[3:] slice.
+        num_values = len(reply) - 3
+        self.assertEqual(num_values, len(min_values))
+        resp = np.fromiter(
+            itertools.islice(reply, 3, None), dtype=float, count=num_values
+        )
+        nan_expected = np.arange(len(min_values)) < self.missed_channels
         if self.in_error_state:
-            self.assertEqual(sensors.ResponseCode.DEVICE_READ_ERROR, response_code)
-        else:
-            self.assertEqual(sensors.ResponseCode.OK, response_code)
-        self.assertEqual(len(resp), self.num_channels)
-        for i in range(0, self.num_channels):
-            if i < self.missed_channels or self.in_error_state:
-                self.assertTrue(math.isnan(resp[i]))
-            elif i == self.disconnected_channel:
-                self.assertTrue(math.isnan(resp[i]))
-            else:
-                self.assertLessEqual(sensors.MockTemperatureConfig.min, resp[i])
-                self.assertLessEqual(resp[i], sensors.MockTemperatureConfig.max)
+            nan_expected[:] = True
+        self._check_telemetry(resp, min_values, max_values, nan_expected)
+
+    def check_hx85a_reply(self, reply):
+        self._check_fixed_reply(reply, "hx85a")
+
+    def check_hx85ba_reply(self, reply):
+        self._check_fixed_reply(reply, "hx85ba")
+
+    def check_temperature_reply(self, reply):
+        self._check_reply_header(reply)
+        num_values = len(reply) - 3
+        self.assertEqual(num_values, self.num_channels)
+        resp = np.fromiter(
+            itertools.islice(reply, 3, None), dtype=float, count=num_values
+        )
+        missed_channels = self.missed_channels
+        in_error_state = self.in_error_state
+        disconnected_channel = self.disconnected_channel
+        if missed_channels == 0 and not in_error_state and disconnected_channel is None:
+            # Common case: every channel is connected and valid, so a plain
+            # bounds check on the whole array suffices.
+            self.assertTrue((sensors.MockTemperatureConfig.min <= resp).all())
+            self.assertTrue((resp <= sensors.MockTemperatureConfig.max).all())
+            return
+        channels = np.arange(self.num_channels)
+        nan_expected = channels < missed_channels
+        if in_error_state:
+            nan_expected[:] = True
+        if disconnected_channel is not None:
+            nan_expected |= channels == disconnected_channel
+        min_values = np.full(self.num_channels, sensors.MockTemperatureConfig.min)
+        max_values = np.full(self.num_channels, sensors.MockTemperatureConfig.max)
+        self._check_telemetry(resp, min_values, max_values, nan_expected)
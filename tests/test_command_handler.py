@@ -30,9 +30,12 @@ logging.basicConfig(
     format="%(asctime)s:%(levelname)s:%(name)s:%(message)s", level=logging.DEBUG
 )
 
+TIMEOUT = 5
+
 
 class CommandHandlerTestCase(BaseMockTestCase):
     async def asyncSetUp(self):
+        await super().asyncSetUp()
         self.command_handler = sensors.CommandHandler(
             callback=self.callback, simulation_mode=1
         )
@@ -75,11 +78,22 @@ class CommandHandlerTestCase(BaseMockTestCase):
         }
         self.responses = []
 
+    async def asyncTearDown(self):
+        await super().asyncTearDown()
+        await self.command_handler.close()
+
     async def callback(self, response):
         self.responses.append(response)
 
-    def assert_response(self, response_code):
-        response = self.responses.pop()
+    async def _next_response(self):
+        while not self.responses:
+            await asyncio.sleep(0.1)
+        return self.responses.pop()
+
+    async def assert_response(self, response_code):
+        # Responses are delivered via a background task so wait, with a
+        # timeout, for one to arrive.
+        response = await asyncio.wait_for(self._next_response(), timeout=TIMEOUT)
         self.assertEqual(response[sensors.Key.RESPONSE], response_code)
 
     async def test_configure(self):
@@ -90,7 +104,7 @@ class CommandHandlerTestCase(BaseMockTestCase):
         await self.command_handler.handle_command(
             command=sensors.Command.CONFIGURE, configuration=self.configuration
         )
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         self.assertDictEqual(self.configuration, self.command_handler._configuration)
 
         # The value for sensors.Key.DEVICES may not be empty.
@@ -98,7 +112,7 @@ class CommandHandlerTestCase(BaseMockTestCase):
         await self.command_handler.handle_command(
             command=sensors.Command.CONFIGURE, configuration=bad_configuration
         )
-        self.assert_response(sensors.ResponseCode.INVALID_CONFIGURATION)
+        await self.assert_response(sensors.ResponseCode.INVALID_CONFIGURATION)
 
         # A configuration with several errors that will get tested one by one.
         bad_items = [
@@ -151,42 +165,42 @@ class CommandHandlerTestCase(BaseMockTestCase):
             await self.command_handler.handle_command(
                 command=sensors.Command.CONFIGURE, configuration=bad_configuration
             )
-            self.assert_response(sensors.ResponseCode.INVALID_CONFIGURATION)
+            await self.assert_response(sensors.ResponseCode.INVALID_CONFIGURATION)
 
     async def test_start(self):
         """Test handling of the start command."""
         await self.command_handler.handle_command(command=sensors.Command.START)
-        self.assert_response(sensors.ResponseCode.NOT_CONFIGURED)
+        await self.assert_response(sensors.ResponseCode.NOT_CONFIGURED)
         self.assertIsNone(self.command_handler._configuration)
         self.assertFalse(self.command_handler._started)
 
         await self.command_handler.handle_command(
             command=sensors.Command.CONFIGURE, configuration=self.configuration
         )
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         self.assertDictEqual(self.configuration, self.command_handler._configuration)
         await self.command_handler.handle_command(command=sensors.Command.START)
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         self.assertTrue(self.command_handler._started)
 
     async def test_stop(self):
         """Test handling of the stop command."""
         await self.command_handler.handle_command(command=sensors.Command.STOP)
-        self.assert_response(sensors.ResponseCode.NOT_STARTED)
+        await self.assert_response(sensors.ResponseCode.NOT_STARTED)
         self.assertIsNone(self.command_handler._configuration)
         self.assertFalse(self.command_handler._started)
 
         await self.command_handler.handle_command(
             command=sensors.Command.CONFIGURE, configuration=self.configuration
         )
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         self.assertDictEqual(self.configuration, self.command_handler._configuration)
         await self.command_handler.handle_command(command=sensors.Command.START)
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         self.assertTrue(self.command_handler._started)
 
         await self.command_handler.handle_command(command=sensors.Command.STOP)
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         # Give time to the telemetry_task to get cancelled.
         await asyncio.sleep(0.5)
         self.assertFalse(self.command_handler._started)
@@ -196,10 +210,10 @@ class CommandHandlerTestCase(BaseMockTestCase):
         await self.command_handler.handle_command(
             command=sensors.Command.CONFIGURE, configuration=self.configuration
         )
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         self.assertDictEqual(self.configuration, self.command_handler._configuration)
         await self.command_handler.handle_command(command=sensors.Command.START)
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         self.assertTrue(self.command_handler._started)
 
         # Give some time to the mock sensor to produce data
@@ -225,7 +239,7 @@ class CommandHandlerTestCase(BaseMockTestCase):
                 self.check_hx85ba_reply(reply_to_check)
 
         await self.command_handler.handle_command(command=sensors.Command.STOP)
-        self.assert_response(sensors.ResponseCode.OK)
+        await self.assert_response(sensors.ResponseCode.OK)
         # Give time to the telemetry_task to get cancelled.
         await asyncio.sleep(0.5)
         self.assertFalse(self.command_handler._started)
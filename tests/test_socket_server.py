@@ -38,6 +38,7 @@ TIMEOUT = 5
 
 class SocketServerTestCase(BaseMockTestCase):
     async def asyncSetUp(self):
+        await super().asyncSetUp()
         self.ctrl = None
         self.writer = None
         self.mock_ctrl = None
@@ -52,6 +53,7 @@ class SocketServerTestCase(BaseMockTestCase):
         )
 
     async def asyncTearDown(self):
+        await super().asyncTearDown()
         await self.srv.disconnect()
         if self.writer:
             self.writer.close()